@@ -3,8 +3,12 @@
 ##############################################################################
 # Python imports.
 from argparse import ArgumentParser, Namespace
-from os import devnull
+from collections.abc import Iterator
+from os import DirEntry, devnull, scandir, sep, stat
+from os.path import join
 from pathlib import Path
+from shutil import copyfileobj
+from stat import S_ISDIR
 from typing import IO, Final
 
 ##############################################################################
@@ -38,10 +42,53 @@ PREAMBLE: Final[str] = """\
 - Text marked with '> [!TYPE]' (e.g., INFO, TODO, WARNING) represents categorized highlights. Treat these as high-signal data.
 """
 
+##############################################################################
+PREAMBLE_WORDS: Final[int] = len(PREAMBLE.split())
+"""The number of words in the builtin preamble."""
+
 ##############################################################################
 WORD_LIMIT: Final[int] = 500_000
 """The word limit for a source in NotebookLM."""
 
+##############################################################################
+OUTPUT_BUFFER_SIZE: Final[int] = 1 << 20
+"""The size of the buffer to use when writing the source file.
+
+Note:
+    The source is written sequentially and can get very large, so a buffer
+    much bigger than the default cuts down on the number of writes made.
+"""
+
+
+##############################################################################
+WORD_CHARACTER_TABLE: Final[bytes] = bytes(
+    0 if character in b" \t\n\r\f\v" else 1 for character in range(256)
+)
+"""Translation table that maps ASCII whitespace bytes to 0 and all others to 1."""
+
+
+##############################################################################
+def count_words(content: bytes) -> int:
+    """Count the words in some content.
+
+    Args:
+        content: The content to count the words in.
+
+    Returns:
+        The number of whitespace-separated words in the content.
+
+    Notes:
+        This gives the same result as `len(content.split())` for `bytes`,
+        but without building a list of every word just to find out how long
+        it is. The content is translated into runs of 0s and 1s and then the
+        start of each run of 1s is counted.
+
+        Only ASCII whitespace separates words; unlike `str.split`, Unicode
+        whitespace such as a non-breaking space doesn't.
+    """
+    classified = content.translate(WORD_CHARACTER_TABLE)
+    return classified.count(b"\x00\x01") + classified.startswith(b"\x01")
+
 
 ##############################################################################
 def resolve_vault(vault: Path) -> Path:
@@ -53,10 +100,12 @@ def resolve_vault(vault: Path) -> Path:
     Returns:
         The full path to the vault, or `None` if there isn't one.
     """
-    if vault.is_dir():
-        return vault
-    if (default_vault := DEFAULT_VAULT_ROOT / vault).is_dir():
-        return default_vault
+    for candidate in (vault, DEFAULT_VAULT_ROOT / vault):
+        try:
+            if S_ISDIR(stat(candidate).st_mode):
+                return candidate
+        except OSError:
+            pass
     print(f"Can't find an Obsidian vault named '{vault}'")
     exit(1)
 
@@ -90,11 +139,74 @@ def get_instructions(instructions: str | None) -> str | None:
         `instructions` then the content of that file will be used, otherwise
         the text will be used.
     """
-    if instructions is not None and Path(instructions).is_file():
-        instructions = Path(instructions).read_text(encoding="utf-8")
+    if instructions is not None and (instructions_file := Path(instructions)).is_file():
+        instructions = instructions_file.read_bytes().decode("utf-8")
     return instructions
 
 
+##############################################################################
+def vault_notes(vault: Path) -> Iterator[DirEntry[str]]:
+    """Find all of the notes in a vault.
+
+    Args:
+        vault: The path to the vault.
+
+    Yields:
+        The directory entry for each note found in the vault.
+
+    Notes:
+        The vault is walked with `os.scandir` rather than `Path.rglob`, as
+        it's a lot faster on larger vaults.
+    """
+    directories = [str(vault)]
+    while directories:
+        try:
+            entries = scandir(directories.pop())
+        except OSError:
+            # Like Path.rglob, quietly skip anything we can't look inside.
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry
+
+
+##############################################################################
+def read_note(note: DirEntry[str]) -> bytes:
+    """Read the content of a note.
+
+    Args:
+        note: The note to read.
+
+    Returns:
+        The raw content of the note.
+
+    Notes:
+        The raw bytes are returned; there's no need to decode and re-encode
+        the content just to count it and copy it into the source.
+    """
+    with open(note.path, "rb") as note_file:
+        return note_file.read()
+
+
+##############################################################################
+def copy_note(note: DirEntry[str], output: IO[bytes]) -> None:
+    """Copy the content of a note into an output file.
+
+    Args:
+        note: The note to copy.
+        output: An open binary writable file object.
+
+    Notes:
+        The content is copied as-is, without being decoded or otherwise
+        looked at.
+    """
+    with open(note.path, "rb") as note_file:
+        copyfileobj(note_file, output, OUTPUT_BUFFER_SIZE)
+
+
 ##############################################################################
 def part_path(source: Path, part: int) -> Path:
     """Get the output file path for a given part number.
@@ -110,32 +222,54 @@ def part_path(source: Path, part: int) -> Path:
 
 
 ##############################################################################
-def write_preamble(output: IO[str], preamble: str, extra_preamble: str) -> None:
+def write_preamble(output: IO[bytes], preamble: str, extra_preamble: str) -> None:
     """Write the preamble block to an output file.
 
     Args:
-        output: An open writable file object.
+        output: An open binary writable file object.
         preamble: The main preamble text.
         extra_preamble: Additional instructions, or empty string if none.
     """
-    output.write(preamble)
+    output.write(preamble.encode())
     if extra_preamble:
-        output.write(f"\n\n# ADDITIONAL RULES\n\n{extra_preamble}")
-    output.write("\n\n---\n\n")
+        output.write(f"\n\n# ADDITIONAL RULES\n\n{extra_preamble}".encode())
+    output.write(b"\n\n---\n\n")
+
+
+##############################################################################
+def open_part(
+    source: Path, part: int, dry_run: bool, preamble: str, extra_preamble: str
+) -> IO[bytes]:
+    """Open the output file for a part and write the preamble to it.
+
+    Args:
+        source: The base output file path.
+        part: The part number to open.
+        dry_run: Is this a dry run?
+        preamble: The main preamble text.
+        extra_preamble: Additional instructions, or empty string if none.
+
+    Returns:
+        The open binary output file, ready for the notes to be written.
+    """
+    output_path = Path(devnull) if dry_run else part_path(source, part)
+    output = output_path.open("wb", buffering=OUTPUT_BUFFER_SIZE)
+    write_preamble(output, preamble, extra_preamble)
+    return output
 
 
 ##############################################################################
-def write_toc(output: IO[str], table_of_content: list[Path]) -> None:
+def write_toc(output: IO[bytes], table_of_content: list[str]) -> None:
     """Write the table of contents block to an output file.
 
     Args:
-        output: An open writable file object.
-        table_of_content: The list of vault-relative paths to include.
+        output: An open binary writable file object.
+        table_of_content: The list of vault-relative paths to include, in
+            the order they should appear.
     """
-    output.write("\n\nBEGIN TABLE OF CONTENT\n\n")
-    for entry in sorted(table_of_content):
-        output.write(f"* {entry}\n")
-    output.write("\n\nEND TABLE OF CONTENT\n\n")
+    output.write(b"\n\nBEGIN TABLE OF CONTENT\n\n")
+    output.write("".join(f"* {entry}\n" for entry in table_of_content).encode())
+    output.write(b"\n\nEND TABLE OF CONTENT\n\n")
 
 
 ##############################################################################
@@ -155,60 +289,88 @@ def make_source(args: Namespace) -> None:
 
     preamble = get_instructions(args.instructions) or PREAMBLE
     extra_preamble = get_instructions(args.additional_instructions) or ""
-    preamble_words = len((preamble + extra_preamble).split())
+    preamble_words = (
+        PREAMBLE_WORDS if preamble == PREAMBLE else len(preamble.split())
+    ) + len(extra_preamble.split())
+
+    # Counting words means looking at every byte of every note, so only do
+    # it if we've been asked to, or if we need to in order to split.
+    counting = args.count or args.split
+    counting_cut_short = False
 
     part = 1
-    current_toc: list[Path] = []
+    part_start = 0
     part_summaries: list[tuple[int, Path]] = []
     estimated_word_count = preamble_words
 
-    output_path = Path(devnull) if args.dry_run else part_path(source, part)
-    notebook_source = output_path.open("w", encoding="utf-8")
-    write_preamble(notebook_source, preamble, extra_preamble)
+    notebook_source = open_part(source, part, args.dry_run, preamble, extra_preamble)
+
+    # Every note's path will start with the path to the vault, so the
+    # vault-relative path can be had by slicing that off.
+    vault_prefix = len(join(vault, ""))
+
+    # Sort the notes up front, so that they're read in path order and so
+    # that the table of content for each part is just a slice of the
+    # relative paths.
+    notes = sorted(vault_notes(vault), key=lambda note: note.path.split(sep))
+    table_of_content = [note.path[vault_prefix:] for note in notes]
 
     try:
-        for vault_file in vault.rglob("*.md"):
-            relative = vault_file.relative_to(vault)
-            content = vault_file.read_text(encoding="utf-8")
-            file_words = len(content.split())
+        for index, (note, relative) in enumerate(
+            zip(notes, table_of_content, strict=True)
+        ):
+            # Only read the content of the note if we need to look at it;
+            # otherwise the note will be copied straight into the source.
+            content = read_note(note) if counting else None
+            file_words = 0 if content is None else count_words(content)
             # Rough overhead: TOC entry + BEGIN/END SOURCE markers per file.
-            toc_overhead = (len(current_toc) + 1) * 7
+            toc_overhead = (index - part_start + 1) * 7
 
             if (
                 args.split
-                and current_toc
+                and index > part_start
                 and estimated_word_count + file_words + toc_overhead > WORD_LIMIT
             ):
-                write_toc(notebook_source, current_toc)
+                write_toc(notebook_source, table_of_content[part_start:index])
                 notebook_source.close()
                 part_summaries.append(
                     (
-                        estimated_word_count + len(current_toc) * 7,
+                        estimated_word_count + (index - part_start) * 7,
                         part_path(source, part),
                     )
                 )
                 part += 1
-                current_toc = []
+                part_start = index
                 estimated_word_count = preamble_words
-                output_path = Path(devnull) if args.dry_run else part_path(source, part)
-                notebook_source = output_path.open("w", encoding="utf-8")
-                write_preamble(notebook_source, preamble, extra_preamble)
+                notebook_source = open_part(
+                    source, part, args.dry_run, preamble, extra_preamble
+                )
                 print(
                     f"  {'Would start' if args.dry_run else 'Starting'} part {part}: {part_path(source, part)}"
                 )
 
-            current_toc.append(relative)
-            notebook_source.write(f"BEGIN SOURCE: {relative}\n\n")
-            notebook_source.write(content)
+            begin = f"BEGIN SOURCE: {relative}\n\n".encode()
+            end = f"\n\nEND SOURCE: {relative}\n\n".encode()
+            if content is None:
+                notebook_source.write(begin)
+                copy_note(note, notebook_source)
+                notebook_source.write(end)
+            else:
+                notebook_source.writelines((begin, content, end))
             estimated_word_count += file_words
-            notebook_source.write(f"\n\nEND SOURCE: {relative}\n\n")
 
-        write_toc(notebook_source, current_toc)
+            # If we're not splitting and we've already gone over the limit
+            # there's no point in counting any further.
+            if counting and not args.split and estimated_word_count > WORD_LIMIT:
+                counting = False
+                counting_cut_short = True
+
+        write_toc(notebook_source, table_of_content[part_start:])
     finally:
         notebook_source.close()
 
     # Add overhead for the final part's TOC and begin/end markers.
-    estimated_word_count += len(current_toc) * 7
+    estimated_word_count += (len(notes) - part_start) * 7
     part_summaries.append((estimated_word_count, part_path(source, part)))
 
     if part > 1:
@@ -217,8 +379,11 @@ def make_source(args: Namespace) -> None:
             print(
                 f"  {path}: ~{words:,} words ({(words / WORD_LIMIT) * 100:.1f}% of limit)"
             )
-    else:
-        print(f"Estimated word count: {estimated_word_count:,}")
+    elif args.count or args.split:
+        if counting_cut_short:
+            print(f"Estimated word count: over {WORD_LIMIT:,}")
+        else:
+            print(f"Estimated word count: {estimated_word_count:,}")
         if estimated_word_count > WORD_LIMIT:
             print("NotebookLM will truncate this source!")
         else:
@@ -246,6 +411,14 @@ def get_args() -> Namespace:
         help="Additional instructions to pass on to NotebookLM at the top of the source",
     )
 
+    # Allow for counting the words in the source.
+    parser.add_argument(
+        "-c",
+        "--count",
+        help="Estimate the word count of the source and compare it to the NotebookLM limit",
+        action="store_true",
+    )
+
     # Allow for a dry run.
     parser.add_argument(
         "-d",